@@ -4,16 +4,82 @@ or https://minimal-agent.com for a tutorial on the basic building principles.
 
 import json
 import logging
+import os
 import traceback
+from functools import cache, lru_cache
 from pathlib import Path
 
-from jinja2 import StrictUndefined, Template
+from jinja2 import Environment as JinjaEnvironment
+from jinja2 import FileSystemBytecodeCache, StrictUndefined, Template
+from platformdirs import user_cache_dir
 from pydantic import BaseModel
 
 from minisweagent import Environment, Model, __version__
 from minisweagent.exceptions import InterruptAgentFlow, LimitsExceeded
 from minisweagent.utils.serialize import recursive_merge
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@cache
+def _get_bytecode_cache() -> FileSystemBytecodeCache | None:
+    """Persist compiled templates across runs, so that a fresh process does not need to re-parse them.
+    Stored in `MSWEA_TEMPLATE_CACHE_DIR` (default: user cache dir), set it to an empty string to disable the cache.
+    """
+    cache_dir = os.getenv("MSWEA_TEMPLATE_CACHE_DIR", str(Path(user_cache_dir("mini-swe-agent")) / "jinja"))
+    if not cache_dir:
+        return None
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(cache_dir)
+
+
+_jinja_env = JinjaEnvironment(undefined=StrictUndefined, autoescape=False)
+
+
+@lru_cache(maxsize=128)
+def _get_compiled(template_source: str) -> Template:
+    """Compile templates only once, they usually stay the same across steps and agents.
+    Compiled code is also kept in the bytecode cache (keyed by the template source) for later runs.
+    """
+    bytecode_cache = _get_bytecode_cache()
+    if bytecode_cache is None:
+        return _jinja_env.from_string(template_source)
+    bucket = bytecode_cache.get_bucket(_jinja_env, template_source, None, template_source)
+    if bucket.code is None:
+        bucket.code = _jinja_env.compile(template_source)
+        bytecode_cache.set_bucket(bucket)
+    return _jinja_env.template_class.from_code(_jinja_env, bucket.code, _jinja_env.make_globals(None))
+
+
+@lru_cache(maxsize=32)
+def _render_plain(template_source: str) -> str | None:
+    """Render templates without any jinja syntax only once, their output does not depend on template vars.
+    Returns None for all other templates.
+    """
+    if "{{" in template_source or "{%" in template_source or "{#" in template_source:
+        return None
+    return _get_compiled(template_source).render()
+
+
+def _dump_json(data: dict) -> bytes:
+    """Dump indented JSON, using the much faster orjson if it is installed.
+    Falls back to the standard library for data that orjson cannot encode
+    (e.g., integers wider than 64 bits or strings with lone surrogates).
+    Both produce the same JSON data, but not the same bytes (orjson writes non-ASCII text as UTF-8).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=2).encode()
+
 
 class AgentConfig(BaseModel):
     """Check the config files in minisweagent/config for example settings."""
@@ -41,26 +107,36 @@ class DefaultAgent:
         self.logger = logging.getLogger("agent")
         self.cost = 0.0
         self.n_calls = 0
+        self._invalidate_caches()
+
+    def _invalidate_caches(self) -> None:
+        """Drop cached values derived from config, environment and model. Call after changing `self.config`."""
+        self._base_template_vars: dict | None = None
+        self._config_json: dict | None = None
 
     def get_template_vars(self, **kwargs) -> dict:
+        if self._base_template_vars is None:
+            self._base_template_vars = recursive_merge(
+                self.config.model_dump(), self.env.get_template_vars(), self.model.get_template_vars()
+            )
         return recursive_merge(
-            self.config.model_dump(),
-            self.env.get_template_vars(),
-            self.model.get_template_vars(),
+            self._base_template_vars,
             {"n_model_calls": self.n_calls, "model_cost": self.cost},
             self.extra_template_vars,
             kwargs,
         )
 
     def _render_template(self, template: str) -> str:
-        return Template(template, undefined=StrictUndefined).render(**self.get_template_vars())
+        if (rendered := _render_plain(template)) is not None:
+            return rendered
+        return _get_compiled(template).render(self.get_template_vars())
 
-    def add_messages(self, *messages: dict) -> list[dict]:
+    def add_messages(self, *messages: dict) -> tuple[dict, ...]:
         self.logger.debug(messages)  # set log level to debug to see
         self.messages.extend(messages)
-        return list(messages)
+        return messages
 
-    def handle_uncaught_exception(self, e: Exception) -> list[dict]:
+    def handle_uncaught_exception(self, e: Exception) -> tuple[dict, ...]:
         return self.add_messages(
             self.model.format_message(
                 role="exit",
@@ -78,6 +154,7 @@ class DefaultAgent:
         """Run step() until agent is finished. Returns dictionary with exit_status, submission keys."""
         self.extra_template_vars |= {"task": task, **kwargs}
         self.messages = []
+        self._invalidate_caches()
         self.add_messages(
             self.model.format_message(role="system", content=self._render_template(self.config.system_template)),
             self.model.format_message(role="user", content=self._render_template(self.config.instance_template)),
@@ -96,7 +173,7 @@ class DefaultAgent:
                 break
         return self.messages[-1].get("extra", {})
 
-    def step(self) -> list[dict]:
+    def step(self) -> tuple[dict, ...]:
         """Query the LM, execute actions."""
         return self.execute_actions(self.query())
 
@@ -116,13 +193,15 @@ class DefaultAgent:
         self.add_messages(message)
         return message
 
-    def execute_actions(self, message: dict) -> list[dict]:
+    def execute_actions(self, message: dict) -> tuple[dict, ...]:
         """Execute actions in message, add observation messages, return them."""
         outputs = [self.env.execute(action) for action in message.get("extra", {}).get("actions", [])]
         return self.add_messages(*self.model.format_observation_messages(message, outputs, self.get_template_vars()))
 
     def serialize(self, *extra_dicts) -> dict:
         """Serialize agent state to a json-compatible nested dictionary for saving."""
+        if self._config_json is None:
+            self._config_json = self.config.model_dump(mode="json")
         last_message = self.messages[-1] if self.messages else {}
         last_extra = last_message.get("extra", {})
         agent_data = {
@@ -132,7 +211,7 @@ class DefaultAgent:
                     "api_calls": self.n_calls,
                 },
                 "config": {
-                    "agent": self.config.model_dump(mode="json"),
+                    "agent": self._config_json,
                     "agent_type": f"{self.__class__.__module__}.{self.__class__.__name__}",
                 },
                 "mini_version": __version__,
@@ -147,9 +226,17 @@ class DefaultAgent:
     def save(self, path: Path | None, *extra_dicts) -> dict:
         """Save the trajectory of the agent to a file if path is given. Returns full serialized data.
         You can pass additional dictionaries with extra data to be (recursively) merged into the output data.
+        The file is replaced atomically, so that an interrupted save never leaves a truncated trajectory behind.
         """
         data = self.serialize(*extra_dicts)
-        if path:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(json.dumps(data, indent=2))
+        if not path:
+            return data
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(_dump_json(data))
+            tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         return data
@@ -53,7 +53,7 @@ class InteractiveAgent(DefaultAgent):
         super().__init__(*args, config_class=config_class, **kwargs)
         self.cost_last_confirmed = 0.0
 
-    def add_messages(self, *messages: dict) -> list[dict]:
+    def add_messages(self, *messages: dict) -> tuple[dict, ...]:
         # Extend supermethod to print messages
         for msg in messages:
             role, content = msg.get("role") or msg.get("type", "unknown"), get_content_string(msg)
@@ -92,9 +92,10 @@ class InteractiveAgent(DefaultAgent):
             )
             self.config.step_limit = int(input("New step limit: "))
             self.config.cost_limit = float(input("New cost limit: "))
+            self._invalidate_caches()
             return super().query()
 
-    def step(self) -> list[dict]:
+    def step(self) -> tuple[dict, ...]:
         # Override the step method to handle user interruption
         try:
             console.print(Rule())
@@ -115,7 +116,7 @@ class InteractiveAgent(DefaultAgent):
                 }
             )
 
-    def execute_actions(self, message: dict) -> list[dict]:
+    def execute_actions(self, message: dict) -> tuple[dict, ...]:
         # Override to handle user confirmation and confirm_exit, with try/finally to preserve partial outputs
         actions = message.get("extra", {}).get("actions", [])
         commands = [action["command"] for action in actions]
@@ -132,7 +133,7 @@ class InteractiveAgent(DefaultAgent):
             )
         return result
 
-    def _add_observation_messages(self, message: dict, outputs: list[dict]) -> list[dict]:
+    def _add_observation_messages(self, message: dict, outputs: list[dict]) -> tuple[dict, ...]:
         return self.add_messages(*self.model.format_observation_messages(message, outputs, self.get_template_vars()))
 
     def _check_for_new_task_or_submit(self, e: Submitted) -> NoReturn:
@@ -209,6 +210,7 @@ class InteractiveAgent(DefaultAgent):
                     f"[bold red]Already in {self.config.mode} mode.[/bold red]\n{prompt}"
                 )
             self.config.mode = self._MODE_COMMANDS_MAPPING[user_input]
+            self._invalidate_caches()
             console.print(f"Switched to [bold green]{self.config.mode}[/bold green] mode.")
             return user_input
         return user_input
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import time
@@ -16,6 +15,7 @@ from minisweagent.models.utils.actions_toolcall import (
 )
 from minisweagent.models.utils.anthropic_utils import _reorder_anthropic_thinking_blocks
 from minisweagent.models.utils.cache_control import set_cache_control
+from minisweagent.models.utils.model_registry import register_model_registry
 from minisweagent.models.utils.openai_multimodal import expand_multimodal_content
 from minisweagent.models.utils.retry import retry
 
@@ -66,8 +66,7 @@ class PortkeyModel:
 
     def __init__(self, *, config_class: type = PortkeyModelConfig, **kwargs):
         self.config = config_class(**kwargs)
-        if self.config.litellm_model_registry and Path(self.config.litellm_model_registry).is_file():
-            litellm.utils.register_model(json.loads(Path(self.config.litellm_model_registry).read_text()))
+        register_model_registry(self.config.litellm_model_registry)
 
         self._api_key = os.getenv("PORTKEY_API_KEY")
         if not self._api_key:
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import time
@@ -14,6 +13,7 @@ from minisweagent.models.utils.actions_toolcall_response import (
     format_toolcall_observation_messages,
     parse_toolcall_actions_response,
 )
+from minisweagent.models.utils.model_registry import register_model_registry
 from minisweagent.models.utils.retry import retry
 
 logger = logging.getLogger("portkey_response_model")
@@ -51,8 +51,7 @@ class PortkeyResponseAPIModel:
 
     def __init__(self, **kwargs):
         self.config = PortkeyResponseAPIModelConfig(**kwargs)
-        if self.config.litellm_model_registry and Path(self.config.litellm_model_registry).is_file():
-            litellm.utils.register_model(json.loads(Path(self.config.litellm_model_registry).read_text()))
+        register_model_registry(self.config.litellm_model_registry)
 
         self._api_key = os.getenv("PORTKEY_API_KEY")
         if not self._api_key:
@@ -38,11 +38,11 @@ def format_observation_messages(
     multimodal_regex: str = "",
 ) -> list[dict]:
     """Format execution outputs into user observation messages."""
+    template = Template(observation_template, undefined=StrictUndefined)
+    template_vars = template_vars or {}
     results = []
     for output in outputs:
-        content = Template(observation_template, undefined=StrictUndefined).render(
-            output=output, **(template_vars or {})
-        )
+        content = template.render(output=output, **template_vars)
         msg: dict = {
             "role": "user",
             "content": content,
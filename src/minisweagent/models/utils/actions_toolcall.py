@@ -76,11 +76,11 @@ def format_toolcall_observation_messages(
     """Format execution outputs into tool result messages."""
     not_executed = {"output": "", "returncode": -1, "exception_info": "action was not executed"}
     padded_outputs = outputs + [not_executed] * (len(actions) - len(outputs))
+    template = Template(observation_template, undefined=StrictUndefined)
+    template_vars = template_vars or {}
     results = []
     for action, output in zip(actions, padded_outputs):
-        content = Template(observation_template, undefined=StrictUndefined).render(
-            output=output, **(template_vars or {})
-        )
+        content = template.render(output=output, **template_vars)
         msg = {
             "content": content,
             "extra": {
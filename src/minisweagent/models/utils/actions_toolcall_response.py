@@ -84,11 +84,11 @@ def format_toolcall_observation_messages(
     """Format execution outputs into function_call_output messages for Responses API."""
     not_executed = {"output": "", "returncode": -1, "exception_info": "action was not executed"}
     padded_outputs = outputs + [not_executed] * (len(actions) - len(outputs))
+    template = Template(observation_template, undefined=StrictUndefined)
+    template_vars = template_vars or {}
     results = []
     for action, output in zip(actions, padded_outputs):
-        content = Template(observation_template, undefined=StrictUndefined).render(
-            output=output, **(template_vars or {})
-        )
+        content = template.render(output=output, **template_vars)
         msg: dict = {
             "extra": {
                 "raw_output": output.get("output", ""),
@@ -0,0 +1,20 @@
+"""Registering litellm model registry files (cost tracking and model metadata)."""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import litellm
+
+
+@lru_cache(maxsize=8)
+def _load_model_registry(path: Path, mtime_ns: int) -> dict:
+    """Parse a registry file. The modification time is part of the cache key, so edited files are re-read."""
+    return json.loads(path.read_text())
+
+
+def register_model_registry(path: Path | str | None) -> None:
+    """Register all models from a litellm model registry file, if it exists."""
+    if not path or not (path := Path(path)).is_file():
+        return
+    litellm.utils.register_model(_load_model_registry(path, path.stat().st_mtime_ns))
@@ -1,6 +1,5 @@
 """Utilities for handling multimodal content in OpenAI-style messages."""
 
-import copy
 import re
 from typing import Any
 
@@ -33,18 +32,17 @@ def _expand_content_string(*, content: str, pattern: str) -> list[dict]:
 
 def expand_multimodal_content(content: Any, *, pattern: str) -> Any:
     """Recursively expand multimodal content in messages.
-    Note: Returns copy of content, original content is not modified.
+    Note: Dicts and lists are shallow-copied, so the input is not modified, but nested values
+    other than `content` (e.g., a message's `extra`) are shared with it.
     """
     if not pattern:
         return content
-    content = copy.deepcopy(content)
     if isinstance(content, str):
         return _expand_content_string(content=content, pattern=pattern)
     if isinstance(content, list):
         return [expand_multimodal_content(item, pattern=pattern) for item in content]
     if isinstance(content, dict):
         if "content" not in content:
-            return content
-        content["content"] = expand_multimodal_content(content["content"], pattern=pattern)
-        return content
+            return dict(content)
+        return {**content, "content": expand_multimodal_content(content["content"], pattern=pattern)}
     return str(content)
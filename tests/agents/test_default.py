@@ -1,4 +1,6 @@
+import json
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import yaml
@@ -305,6 +307,84 @@ def test_render_template_model_stats(model_factory):
     assert agent._render_template(template) == "Calls: 2, Cost: 2.0"
 
 
+def test_add_messages_returns_added_messages(model_factory):
+    """Test that add_messages returns exactly the messages it added."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory([]), env=LocalEnvironment(), **config)
+    first = {"role": "system", "content": "test"}
+    second = {"role": "user", "content": "test"}
+
+    assert agent.add_messages(first, second) == (first, second)
+    assert agent.add_messages() == ()
+    assert agent.messages == [first, second]
+
+
+def test_template_vars_cached_until_invalidated(model_factory):
+    """Test that config-derived template vars are cached, while stats and extra vars stay up to date."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory([]), env=LocalEnvironment(), **{**config, "step_limit": 3})
+
+    template = "{{step_limit}} {{n_model_calls}} {{task}}"
+    agent.extra_template_vars["task"] = "a"
+    assert agent._render_template(template) == "3 0 a"
+    agent.config.step_limit = 5
+    agent.n_calls = 1
+    agent.extra_template_vars["task"] = "b"
+    assert agent._render_template(template) == "3 1 b"
+    agent._invalidate_caches()
+    assert agent._render_template(template) == "5 1 b"
+
+
+def test_template_vars_merge_nested_extra_vars(model_factory):
+    """Test that nested extra template vars are merged into, not replace, nested base vars."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory([]), env=LocalEnvironment(), **config)
+    agent._base_template_vars = {"nested": {"a": 1, "b": 2}}
+
+    agent.extra_template_vars["nested"] = {"b": 3}
+    assert agent.get_template_vars(nested={"c": 4})["nested"] == {"a": 1, "b": 3, "c": 4}
+    assert agent._base_template_vars == {"nested": {"a": 1, "b": 2}}
+
+
+def test_render_template_without_jinja_syntax(model_factory):
+    """Test that templates without jinja syntax render exactly like jinja would render them."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory([]), env=LocalEnvironment(), **config)
+
+    assert agent._render_template("Fixed instructions.\n") == "Fixed instructions."
+    assert agent._render_template("Use {braces} and 100%\n\n") == "Use {braces} and 100%\n"
+    assert agent._render_template("{# comment #}Task") == "Task"
+
+
+def test_template_bytecode_cache(tmp_path, monkeypatch):
+    """Test that compiled templates are written to and read from MSWEA_TEMPLATE_CACHE_DIR, if it is not empty."""
+    import minisweagent.agents.default as default_module
+
+    template = "Bytecode cache test {{ value }}"
+    assert default_module._get_bytecode_cache() is None
+    monkeypatch.setenv("MSWEA_TEMPLATE_CACHE_DIR", str(tmp_path / "jinja"))
+    default_module._get_bytecode_cache.cache_clear()
+    default_module._get_compiled.cache_clear()
+    try:
+        assert default_module._get_compiled(template).render(value=1) == "Bytecode cache test 1"
+        assert len(list((tmp_path / "jinja").iterdir())) == 1
+        default_module._get_compiled.cache_clear()
+        with patch.object(default_module._jinja_env, "compile", side_effect=AssertionError("not cached")):
+            assert default_module._get_compiled(template).render(value=2) == "Bytecode cache test 2"
+    finally:
+        default_module._get_bytecode_cache.cache_clear()
+        default_module._get_compiled.cache_clear()
+
+
+def test_render_template_include_not_supported(model_factory):
+    """Test that templates cannot include, extend or import other templates, since there is no loader."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory([]), env=LocalEnvironment(), **config)
+
+    with pytest.raises(TypeError, match="no loader"):
+        agent._render_template('{% include "foo.txt" %}')
+
+
 def test_messages_include_timestamps(model_factory):
     """Test that assistant and observation messages include timestamps."""
     factory, config = model_factory
@@ -423,3 +503,22 @@ def test_empty_actions_handling(model_factory):
     assert info["exit_status"] == "Submitted"
     assert info["submission"] == "done\n"
     assert agent.n_calls == 2
+
+
+def test_uncaught_exception_traceback_serialized(model_factory):
+    """Test that the traceback of an uncaught exception is stored in the serialized trajectory."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory([]), env=LocalEnvironment(), **config)
+
+    try:
+        raise RuntimeError("agent exploded")
+    except RuntimeError as e:
+        agent.handle_uncaught_exception(e)
+    extra = agent.messages[-1]["extra"]
+    assert extra["exit_status"] == "RuntimeError"
+    data = agent.serialize()
+    traceback_str = data["messages"][-1]["extra"]["traceback"]
+    assert traceback_str.startswith("Traceback (most recent call last):")
+    assert "RuntimeError: agent exploded" in traceback_str
+    assert data["info"]["exit_status"] == "RuntimeError"
+    assert json.loads(json.dumps(data))["messages"][-1]["extra"]["traceback"] == traceback_str
@@ -140,7 +140,7 @@ def test_expand_multimodal_content_nested():
 
 
 def test_expand_multimodal_content_preserves_original():
-    """Test that expand_multimodal_content deep copies and doesn't modify original."""
+    """Test that expand_multimodal_content doesn't modify the original."""
     original = {
         "role": "user",
         "content": "text <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>image.png</MSWEA_MULTIMODAL_CONTENT>",
@@ -150,6 +150,27 @@ def test_expand_multimodal_content_preserves_original():
     assert original["content"] == original_content
 
 
+def test_expand_multimodal_content_copies_only_content():
+    """Test that content is expanded into a new message, while the input message and its extra stay unchanged."""
+    extra = {"raw_output": "image.png", "returncode": 0}
+    original = {
+        "role": "user",
+        "content": "text <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>image.png</MSWEA_MULTIMODAL_CONTENT>",
+        "extra": extra,
+    }
+    original_copy = {**original, "extra": dict(extra)}
+
+    result = expand_multimodal_content(original, pattern=DEFAULT_MULTIMODAL_REGEX)
+    assert result is not original
+    assert result["content"] == [
+        {"type": "text", "text": "text "},
+        {"type": "image_url", "image_url": {"url": "image.png"}},
+    ]
+    assert result["role"] == "user"
+    assert result["extra"] == extra
+    assert original == original_copy
+
+
 def test_model_format_message_with_multimodal():
     """Test that model.format_message applies multimodal transformation when configured."""
     from minisweagent.models.test_models import DeterministicModel
@@ -1,4 +1,5 @@
 import json
+import os
 import re
 import threading
 from pathlib import Path
@@ -7,6 +8,9 @@ import pytest
 
 from minisweagent.models import GLOBAL_MODEL_STATS
 
+# Keep compiled templates out of the user's cache directory during tests
+os.environ["MSWEA_TEMPLATE_CACHE_DIR"] = ""
+
 
 def pytest_addoption(parser):
     """Add custom command line options."""
@@ -1,4 +1,5 @@
 import json
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -61,6 +62,37 @@ def test_model_registry_loading():
         Path(registry_path).unlink()
 
 
+def test_model_registry_parsed_once(tmp_path):
+    """Test that a registry file is only parsed again after it was modified."""
+    registry_path = tmp_path / "registry.json"
+    registry_path.write_text(json.dumps({"my-cached-model": {"input_cost_per_token": 0.1, "mode": "chat"}}))
+
+    with patch("litellm.utils.register_model") as mock_register:
+        LitellmTextbasedModel(model_name="my-cached-model", litellm_model_registry=registry_path)
+        LitellmTextbasedModel(model_name="my-cached-model", litellm_model_registry=str(registry_path))
+        first, second = (call.args[0] for call in mock_register.call_args_list)
+        assert first is second
+
+        registry_path.write_text(json.dumps({"my-cached-model": {"input_cost_per_token": 0.2, "mode": "chat"}}))
+        os.utime(registry_path, ns=(0, registry_path.stat().st_mtime_ns + 1))
+        LitellmTextbasedModel(model_name="my-cached-model", litellm_model_registry=registry_path)
+        assert mock_register.call_args.args[0] == {"my-cached-model": {"input_cost_per_token": 0.2, "mode": "chat"}}
+
+
+def test_model_registry_reregistered_after_other_file(tmp_path):
+    """Test that switching back to a registry file registers it again, so its pricing takes effect."""
+    registry_a = tmp_path / "registry_a.json"
+    registry_b = tmp_path / "registry_b.json"
+    registry_a.write_text(json.dumps({"my-switched-model": {"input_cost_per_token": 0.1, "mode": "chat"}}))
+    registry_b.write_text(json.dumps({"my-switched-model": {"input_cost_per_token": 0.2, "mode": "chat"}}))
+
+    with patch("litellm.utils.register_model") as mock_register:
+        for registry_path in [registry_a, registry_b, registry_a]:
+            LitellmTextbasedModel(model_name="my-switched-model", litellm_model_registry=registry_path)
+        assert mock_register.call_count == 3
+        assert mock_register.call_args.args[0] == {"my-switched-model": {"input_cost_per_token": 0.1, "mode": "chat"}}
+
+
 def test_model_registry_none():
     """Test that no registry loading occurs when litellm_model_registry is None."""
     with patch("litellm.register_model") as mock_register:
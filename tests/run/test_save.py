@@ -2,6 +2,9 @@ import json
 import tempfile
 from pathlib import Path
 
+import pytest
+
+import minisweagent.agents.default
 from minisweagent.agents.default import DefaultAgent
 from minisweagent.environments.local import LocalEnvironment
 from minisweagent.models.test_models import DeterministicModel, make_output
@@ -68,3 +71,114 @@ def test_agent_serialize():
     assert "info" in data
     assert "config" in data["info"]
     assert "messages" in data
+
+
+def test_agent_serialize_config_cached_until_invalidated():
+    """Test that the serialized agent config is cached and refreshed after invalidating the caches."""
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(
+        model, LocalEnvironment(), system_template="system", instance_template="instance", step_limit=3
+    )
+
+    assert agent.serialize()["info"]["config"]["agent"]["step_limit"] == 3
+    agent.config.step_limit = 17
+    assert agent.serialize()["info"]["config"]["agent"]["step_limit"] == 3
+    agent._invalidate_caches()
+    assert agent.serialize()["info"]["config"]["agent"]["step_limit"] == 17
+
+
+def test_agent_save_writes_in_place_changes(tmp_path):
+    """Test that every save rewrites the file, including in-place edits of messages, and leaves no temp file."""
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(model, LocalEnvironment(), system_template="system", instance_template="instance")
+    traj_path = tmp_path / "nested" / "test.traj.json"
+
+    agent.add_messages({"role": "system", "content": "test system message", "extra": {}})
+    agent.save(traj_path)
+    agent.messages[-1]["extra"]["note"] = "edited"
+    agent.save(traj_path)
+    assert json.loads(traj_path.read_text())["messages"][-1]["extra"]["note"] == "edited"
+
+    agent.save(traj_path, {"info": {"submission": "extra"}})
+    assert json.loads(traj_path.read_text())["info"]["submission"] == "extra"
+    agent.save(traj_path)
+    assert json.loads(traj_path.read_text())["info"]["submission"] == ""
+    assert [p.name for p in traj_path.parent.iterdir()] == ["test.traj.json"]
+
+
+def test_agent_save_failure_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a failed save keeps the previous trajectory and removes the temp file."""
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(model, LocalEnvironment(), system_template="system", instance_template="instance")
+    traj_path = tmp_path / "test.traj.json"
+    agent.add_messages({"role": "system", "content": "test system message"})
+    agent.save(traj_path)
+    previous = traj_path.read_bytes()
+
+    def write_partially(self, data):
+        Path.write_text(self, "partial")
+        raise OSError("disk full")
+
+    agent.add_messages({"role": "user", "content": "test user message"})
+    monkeypatch.setattr(Path, "write_bytes", write_partially)
+    with pytest.raises(OSError, match="disk full"):
+        agent.save(traj_path)
+    monkeypatch.undo()
+    assert traj_path.read_bytes() == previous
+    assert [p.name for p in tmp_path.iterdir()] == ["test.traj.json"]
+
+
+def test_agent_save_roundtrip(tmp_path):
+    """Test that saved trajectories round-trip, including non-ASCII content."""
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(model, LocalEnvironment(), system_template="system", instance_template="instance")
+    agent.add_messages(
+        {"role": "system", "content": "héllo wörld ✓"},
+        {"role": "user", "content": 'line1\nline2\t"quoted"', "extra": {"cost": 0.5, "actions": [], "n": None}},
+    )
+    traj_path = tmp_path / "test.traj.json"
+
+    data = agent.save(traj_path)
+    assert json.loads(traj_path.read_bytes()) == json.loads(json.dumps(data))
+    assert json.loads(traj_path.read_bytes())["messages"][0]["content"] == "héllo wörld ✓"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_agent_save_same_data_with_and_without_orjson(tmp_path, monkeypatch, use_orjson):
+    """Test that trajectories saved with orjson and the standard library encoder contain the same data."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(minisweagent.agents.default, "orjson", None)
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(model, LocalEnvironment(), system_template="system", instance_template="instance")
+    agent.add_messages(
+        {"role": "system", "content": "héllo wörld ✓"},
+        {"role": "user", "content": "text", "extra": {"cost": 1e-05, "actions": [], "nested": {}, "n": None}},
+    )
+    traj_path = tmp_path / "test.traj.json"
+
+    data = agent.save(traj_path)
+    assert json.loads(traj_path.read_bytes()) == json.loads(json.dumps(data))
+
+
+def test_agent_save_lone_surrogates(tmp_path):
+    """Test that strings with lone surrogates (which orjson rejects) are still saved."""
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(model, LocalEnvironment(), system_template="system", instance_template="instance")
+    agent.add_messages({"role": "assistant", "content": "bad \udce9 byte"})
+    traj_path = tmp_path / "test.traj.json"
+
+    agent.save(traj_path)
+    assert json.loads(traj_path.read_bytes())["messages"][0]["content"] == "bad \udce9 byte"
+
+
+def test_agent_save_large_integers(tmp_path):
+    """Test that integers that orjson cannot encode are still saved."""
+    model = DeterministicModel(outputs=[make_output("echo 'test'", [])])
+    agent = DefaultAgent(model, LocalEnvironment(), system_template="system", instance_template="instance")
+    agent.add_messages({"role": "user", "content": "text", "extra": {"big": 2**70}})
+    traj_path = tmp_path / "test.traj.json"
+
+    agent.save(traj_path)
+    assert json.loads(traj_path.read_bytes())["messages"][0]["extra"]["big"] == 2**70